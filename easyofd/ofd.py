@@ -77,15 +77,18 @@ class OFD(object):
         Raises:
             Exception: 当fmt参数值不在允许范围内时抛出异常
         """
+        # path/binary/io 统一走原始字节，不再绕道base64编码再解码：
+        # 大文件可省两次O(N)遍历和约2.3倍的峰值内存
         if fmt == "path":
             with open(ofd_f, "rb") as f:
-                ofd_f = str(base64.b64encode(f.read()), encoding="utf-8")
+                ofd_f = f.read()
         elif fmt == "b64":
             pass
         elif fmt == "binary":
-            ofd_f = str(base64.b64encode(ofd_f), encoding="utf-8")
+            pass
         elif fmt == "io":
-            ofd_f = str(base64.b64encode(ofd_f.getvalue()), encoding="utf-8")
+            # getbuffer直接借用BytesIO内部缓冲（零拷贝），getvalue会整份复制
+            ofd_f = ofd_f.getbuffer()
         else:
             raise "fomat Error: %s" % fmt
 
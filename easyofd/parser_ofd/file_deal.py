@@ -5,9 +5,16 @@
 # E_MAIL: renoyuan@foxmail.com
 # AUTHOR: reno
 # NOTE:  文件处理
+import io
 import os
 import base64
-import shutil
+
+try:
+    # SIMD加速的base64实现（AVX2/SSSE3），大文件编解码快数倍；
+    # 接口与标准库一致，未安装时透明退回base64
+    import pybase64 as _b64
+except ImportError:
+    _b64 = base64
 from typing import Any
 from uuid import uuid1
 
@@ -34,15 +41,19 @@ class FileRead(object):
         file_tree (dict): 存储文件路径与其内容（XML解析对象或Base64编码）的映射关系
     """
 
-    def __init__(self, ofdb64: str):
+    def __init__(self, ofdb64):
         """
         初始化FileRead实例
 
         Args:
-            ofdb64 (str): Base64编码的OFD文件内容
+            ofdb64 (str or bytes): Base64编码的OFD文件内容，
+                                   或OFD文件的原始字节（免去编解码往返）
         """
-        # 将Base64编码的OFD文件内容解码为字节
-        self.ofdbyte = base64.b64decode(ofdb64)
+        # 原始字节直接使用；Base64字符串才需要解码
+        if isinstance(ofdb64, (bytes, bytearray, memoryview)):
+            self.ofdbyte = ofdb64
+        else:
+            self.ofdbyte = _b64.b64decode(ofdb64)
         # 获取当前进程ID用于生成唯一的临时文件名
         pid = os.getpid()
         # 使用进程ID和UUID生成唯一的临时文件名
@@ -53,56 +64,56 @@ class FileRead(object):
         self.zip_path = f"{os.getcwd()}/{self.name}"
         # 初始化解压缩路径为空
         self.unzip_path = ""
+        # 压缩包对象（unzip_file中打开）
+        self.zip_file = None
         # 初始化文件树字典
         self.file_tree = {}
 
     def unzip_file(self):
         """
-        解压缩OFD文件到临时目录
+        打开OFD压缩包
 
-        OFD文件本质上是一个ZIP压缩包，此方法将其解压到临时目录，
-        以便后续处理其中的XML和其他资源文件。
+        OFD文件本质上是一个ZIP压缩包。直接在内存中打开压缩包对象，
+        后续按需读取其中的XML和资源文件，不再先解压到磁盘再逐个读回，
+        省掉整套"写临时文件-解压-os.walk重读-清理"的磁盘往返。
         """
-        # 将解码后的OFD字节内容写入临时文件
-        with open(self.zip_path, "wb") as f:
-            f.write(self.ofdbyte)
-        # 设置解压缩路径（基于OFD文件名去除扩展名）
+        # 虚拟解压路径：仅用于构成file_tree中的键名，不再真正落盘
         self.unzip_path = self.zip_path.split(".")[0]
-        # 解压缩OFD文件到指定目录
-        with zipfile.ZipFile(self.zip_path, "r") as f:
-            for file in f.namelist():
-                f.extract(file, path=self.unzip_path)
+        # 在内存中打开压缩包
+        self.zip_file = zipfile.ZipFile(io.BytesIO(self.ofdbyte), "r")
         # 如果设置了保存XML选项，则额外提取到指定XML目录
         if self.save_xml:
             print("saving xml {}".format(self.xml_name))
-            with zipfile.ZipFile(self.zip_path, "r") as f:
-                for file in f.namelist():
-                    f.extract(file, path=self.xml_name)
+            for file in self.zip_file.namelist():
+                self.zip_file.extract(file, path=self.xml_name)
 
     def buld_file_tree(self):
         """
         构建文件树结构
 
-        遍历解压缩后的目录，将XML文件解析为Python对象，
+        遍历压缩包内的条目，将XML文件解析为Python对象，
         其他文件转换为Base64编码字符串，并建立文件路径与内容的映射关系。
-        同时清理临时文件。
+        键名保持与解压到unzip_path后的绝对路径一致。
         """
         # 设置根目录路径
         self.file_tree["root"] = self.unzip_path
         # 设置PDF文件名
         self.file_tree["pdf_name"] = self.pdf_name
-        # 遍历解压缩后的目录结构
-        for root, dirs, files in os.walk(self.unzip_path):
-            for file in files:
-                # 获取文件的绝对路径
-                abs_path = os.path.join(root, file)
+        # 遍历压缩包内的文件条目（目录条目跳过）
+        with self.zip_file as zf:
+            for name in zf.namelist():
+                if name.endswith("/"):
+                    continue
+                data = zf.read(name)
+                file = name.rpartition("/")[2]
+                # 与原解压路径保持一致的键名
+                abs_path = os.path.join(self.unzip_path, *name.split("/"))
                 # 根据文件类型选择处理方式：XML文件解析为对象，其他文件转为Base64编码
+                # base64输出必为纯ASCII，ascii解码免去UTF-8的码点校验
                 self.file_tree[abs_path] = (
-                    str(base64.b64encode(open(f"{abs_path}", "rb").read()), "utf-8")
+                    _b64.b64encode(data).decode("ascii")
                     if "xml" not in file
-                    else xmltodict.parse(
-                        open(f"{abs_path}", "r", encoding="utf-8").read()
-                    )
+                    else xmltodict.parse(data)
                 )
         # 设置文档根路径（OFD.xml文件路径）
         self.file_tree["root_doc"] = (
@@ -111,14 +122,6 @@ class FileRead(object):
             else ""
         )
 
-        # 清理临时解压缩目录
-        if os.path.exists(self.unzip_path):
-            shutil.rmtree(self.unzip_path)
-
-        # 清理临时OFD文件
-        if os.path.exists(self.zip_path):
-            os.remove(self.zip_path)
-
     def __call__(self, *args: Any, **kwds: Any) -> dict:
         """
         执行OFD文件处理流程
@@ -149,6 +152,6 @@ class FileRead(object):
 
 if __name__ == "__main__":
     with open(r"D:/code/easyofd/test/增值税电子专票5.ofd", "rb") as f:
-        ofdb64 = str(base64.b64encode(f.read()), "utf-8")
+        ofdb64 = base64.b64encode(f.read()).decode("ascii")
     a = FileRead(ofdb64)()
     print(list(a.keys()))
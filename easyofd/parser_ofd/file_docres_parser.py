@@ -6,7 +6,7 @@
 # AUTHOR: reno
 # NOTE: 解析 DocumentRes
 
-import os
+import sys
 
 from .file_parser_base import FileParserBase
 
@@ -45,24 +45,30 @@ class DocumentResFileParser(FileParserBase):
                 }
                 如果没有找到任何多媒体资源，则返回空字典
         """
-        info = {}  # 初始化存储媒体信息的字典
-        muti_media: list = []  # 存储找到的所有多媒体对象
-        muti_media_key = "ofd:MultiMedia"  # 多媒体对象在XML中的标签名
+        intern = sys.intern  # 提前绑定，循环内直接用局部名
 
-        # 递归查找XML中所有的ofd:MultiMedia节点，并将结果存入muti_media列表
-        self.recursion_ext(self.xml_obj, muti_media, muti_media_key)
+        def media_file(media):
+            """计算格式、后缀名和完整文件名字段
 
-        if muti_media:  # 如果找到了多媒体对象
-            for media in muti_media:  # 遍历每一个媒体对象
-                name = media.get("ofd:MediaFile", "")  # 获取媒体文件名
-                info[media.get("@ID")] = {  # 使用媒体ID作为键，存储相关信息
-                    "format": media.get("@Format", ""),  # 媒体格式
-                    "wrap_pos": media.get("@wrap_pos", ""),  # 包装位置
-                    # "Boundary": media.get("@Boundary", ""),  # 边界信息（被注释掉）
-                    "type": media.get("@Type", ""),  # 媒体类型
-                    "suffix": os.path.splitext(name)[-1].replace(
-                        ".", ""
-                    ),  # 提取文件后缀名（去掉点号）
-                    "fileName": name,  # 完整文件名
-                }
-        return info  # 返回包含所有媒体信息的字典
+            同一文档内大量媒体文件的格式/后缀字符串高度重复（png、jpg等），
+            用sys.intern去重，省内存的同时让下游比较走指针相等的快路径。
+            """
+            name = media.get("ofd:MediaFile", "")  # 获取媒体文件名
+            return {
+                "format": intern(media.get("@Format", "") or ""),  # 媒体格式
+                "suffix": (
+                    intern(name.rpartition(".")[2].lower()) if "." in name else ""
+                ),  # 提取文件后缀名（去掉点号）
+                "fileName": name,  # 完整文件名
+            }
+
+        # 查找所有的ofd:MultiMedia节点并批量抽取属性，以媒体ID为键
+        return self._build_info_dict(
+            "ofd:MultiMedia",
+            {
+                "wrap_pos": ("@wrap_pos", ""),  # 包装位置
+                # "Boundary": ("@Boundary", ""),  # 边界信息（被注释掉）
+                "type": ("@Type", ""),  # 媒体类型
+            },
+            extra=media_file,
+        )  # 返回包含所有媒体信息的字典
@@ -9,11 +9,13 @@
 import sys
 
 sys.path.insert(0, "..")
+import io
 import logging
 import os
 import traceback
 import base64
 import re
+import xml.etree.ElementTree as ET
 from typing import Any
 from .parameter_parser import ParameterParser
 
@@ -28,25 +30,240 @@ class FileParserBase(object):
     主要包含初始化方法和递归提取XML节点的功能，供其他具体的解析器类继承使用。
 
     Attributes:
-        ofd_param (ParameterParser): OFD参数解析器实例，用于处理OFD相关参数
-        xml_obj (dict): XML对象，通常是由XML文件解析后得到的字典结构
+        ofd_param (ParameterParser): OFD参数解析器实例，用于处理OFD相关参数。
+                                     解析器无状态，全部子类共享类级别的同一个实例
+        xml_obj (dict): XML对象，通常是由XML文件解析后得到的字典结构，
+                        也可以是ElementTree/lxml的元素对象（跳过整树转dict）
     """
 
+    # ParameterParser无实例状态，类级别共享一个实例即可，
+    # 避免每解析一个文件都重新构造
+    ofd_param = ParameterParser()
+
     def __init__(self, xml_obj):
         """
         初始化文件解析器基类
 
         Args:
-            xml_obj: XML对象，通常是解析后的XML文档字典结构
+            xml_obj: XML对象，通常是解析后的XML文档字典结构，
+                     也支持直接传入xml.etree.ElementTree或lxml的Element对象
 
         Raises:
             AssertionError: 当xml_obj为空或None时抛出断言错误
         """
-        assert xml_obj  # 确保传入的XML对象不为空
-        self.ofd_param = ParameterParser()  # 创建OFD参数解析器实例
+        assert xml_obj is not None and (
+            self._is_element(xml_obj) or xml_obj
+        )  # 确保传入的XML对象不为空
         self.xml_obj = xml_obj  # 存储XML对象
+        self._lookup_cache = {}  # 按标签名缓存recursion_ext的查找结果
+        self._buckets = None  # from_xml_bytes预建的节点桶，按本地标签名分组
         # print(xml_obj)  # 注释掉的调试语句
 
+    @classmethod
+    def from_xml_bytes(cls, data, keys):
+        """
+        从XML字节流直接构建解析器（流式解析，跳过整树物化）
+
+        使用iterparse流式读取文档：只有标签名命中keys的节点才被转换为
+        xmltodict风格的字典并收入对应的桶，其余节点在遍历后立即clear()
+        释放，峰值内存从O(整棵树)降为O(命中节点数)。构建出的实例上，
+        _lookup直接按桶返回结果，不再遍历self.xml_obj。
+
+        Args:
+            data (bytes): XML文档的原始字节内容
+            keys (iterable): 需要收集的标签名集合（例如 {'ofd:MultiMedia'}，
+                             带不带命名空间前缀均可）
+
+        Returns:
+            FileParserBase: 持有预建节点桶的解析器实例
+
+        Raises:
+            AssertionError: 当keys为空时抛出断言错误
+        """
+        buckets = {key.rpartition(":")[2]: [] for key in keys}
+        assert buckets  # 至少需要一个目标标签
+        for _, elem in ET.iterparse(io.BytesIO(data), events=("end",)):
+            bucket = buckets.get(elem.tag.rpartition("}")[2])
+            if bucket is not None:
+                value = cls._as_dict(elem)
+                if value is not None:
+                    bucket.append(value)
+                # 子树内容已捕获，立即释放以控制大文件的峰值内存
+                elem.clear()
+        inst = cls(buckets)
+        inst._buckets = buckets
+        return inst
+
+    @staticmethod
+    def _is_element(obj):
+        """
+        判断对象是否为ElementTree/lxml风格的元素节点
+
+        通过鸭子类型检测（存在tag属性和iter方法），同时兼容标准库
+        xml.etree.ElementTree和lxml.etree两种元素实现。
+
+        Args:
+            obj: 待检测的对象
+
+        Returns:
+            bool: 是元素节点返回True，否则返回False
+        """
+        return hasattr(obj, "tag") and hasattr(obj, "iter")
+
+    @classmethod
+    def _as_dict(cls, element):
+        """
+        将单个元素节点转换为xmltodict风格的字典
+
+        只对匹配到的节点做惰性转换（而不是整棵树），属性映射为"@属性名"键，
+        子节点映射为"ofd:标签名"键（重复标签合并为列表），文本内容映射为
+        "#text"键；没有属性和子节点的纯文本元素直接返回文本字符串。
+
+        Args:
+            element: ElementTree/lxml的元素对象
+
+        Returns:
+            dict or str or None: 与xmltodict.parse产出形状一致的节点内容
+        """
+        cell = {}
+        for attr_name, attr_value in element.attrib.items():
+            # 属性名可能带Clark记法命名空间（{uri}Name），只保留本地名
+            cell[f"@{attr_name.rpartition('}')[2]}"] = attr_value
+        for child in element:
+            tag = getattr(child, "tag", None)
+            if not isinstance(tag, str):  # 跳过lxml的注释/处理指令节点
+                continue
+            key = f"ofd:{tag.rpartition('}')[2]}"
+            value = cls._as_dict(child)
+            exist = cell.get(key)
+            if exist is None:
+                cell[key] = value
+            elif isinstance(exist, list):
+                # 重复标签：追加到已有列表
+                exist.append(value)
+            else:
+                cell[key] = [exist, value]
+        text = (element.text or "").strip()
+        if cell:
+            if text:
+                cell["#text"] = text
+            return cell
+        # 没有属性和子节点时与xmltodict保持一致：返回纯文本或None
+        return text if text else None
+
+    def _lookup(self, key):
+        """
+        按标签名查找所有匹配节点（带缓存）
+
+        recursion_ext的缓存包装：同一个解析器实例对同一标签的重复查找
+        只遍历一次XML树，之后直接命中缓存。
+
+        Args:
+            key (str): 要提取的键名（例如 'ofd:MultiMedia', 'ofd:Page' 等）
+
+        Returns:
+            list: 所有匹配节点组成的列表，无匹配时为空列表
+        """
+        # from_xml_bytes构建的实例直接按预建的桶返回，无需再遍历
+        if self._buckets is not None:
+            return self._buckets.get(key.rpartition(":")[2], [])
+        nodes = self._lookup_cache.get(key)
+        if nodes is None:
+            nodes = list(self.recursion_iter(self.xml_obj, key))
+            self._lookup_cache[key] = nodes
+        return nodes
+
+    def recursion_iter(self, need_ext_obj, key):
+        """
+        惰性提取XML对象中指定键的值（生成器版本）
+
+        与recursion_ext语义一致，但逐个产出匹配节点而不构建中间列表，
+        调用方可以边遍历边消费（例如只取第一个匹配时提前终止）。
+
+        Args:
+            need_ext_obj (dict or list): 待提取的XML对象（通常是字典结构）
+            key (str): 要提取的键名（例如 'ofd:MultiMedia', 'ofd:Page' 等）
+
+        Yields:
+            dict or str: 匹配到的节点值
+        """
+        # 元素节点走C层的后代迭代器（libxml2/expat），替代Python层的深度优先遍历
+        if self._is_element(need_ext_obj):
+            localname = key.rpartition(":")[2]
+            if type(need_ext_obj).__module__.startswith("lxml"):
+                # lxml的iter支持"{*}标签"通配命名空间，过滤在libxml2内完成
+                matched = need_ext_obj.iter(f"{{*}}{localname}")
+            else:
+                # 标准库的iter不支持通配符，按本地名在迭代时过滤
+                matched = (
+                    elem
+                    for elem in need_ext_obj.iter()
+                    if isinstance(elem.tag, str)
+                    and elem.tag.rpartition("}")[2] == localname
+                )
+            for elem in matched:
+                value = self._as_dict(elem)
+                if value is not None:
+                    yield value
+            return
+        if not isinstance(need_ext_obj, dict):
+            return
+        # 用显式迭代器栈做深度优先遍历，替代逐层嵌套的生成器递归：
+        # 深层文档不再为每一层付出Python函数帧和yield from转发的开销，
+        # 产出顺序与原递归实现（文档序）完全一致
+        stack = [iter(need_ext_obj.items())]
+        while stack:
+            frame = stack[-1]
+            descended = False
+            for k, v in frame:
+                if k == key:
+                    # 命中目标键：字典/字符串直接产出，列表逐个产出
+                    if isinstance(v, (dict, str)):
+                        yield v
+                    elif isinstance(v, list):
+                        yield from v
+                elif isinstance(v, dict):
+                    # 深入子字典，当前层的剩余键值留在frame中待回溯后继续
+                    stack.append(iter(v.items()))
+                    descended = True
+                    break
+                elif isinstance(v, list):
+                    # 列表元素包装为(None, cell)沿用同一套遍历逻辑
+                    stack.append((None, cell) for cell in v)
+                    descended = True
+                    break
+            if not descended:
+                stack.pop()
+
+    def _build_info_dict(self, key, fields, extra=None):
+        """
+        通用的"节点列表 -> 以@ID为键的信息字典"构建器
+
+        各具体解析器（DocumentRes/PublicRes/Signatures等）共用的快速路径：
+        查找所有匹配节点后，按fields映射批量抽取属性。循环内只做局部变量
+        与n.get的查找，避免每次迭代重复的属性解析开销。
+
+        Args:
+            key (str): 节点标签名（例如 'ofd:MultiMedia'）
+            fields (dict): 输出字段映射，格式为 {输出键: (节点键, 默认值)}
+            extra (callable, optional): 对每个节点计算附加字段的函数，
+                                        入参为节点字典，返回需要合并的字典
+
+        Returns:
+            dict: 以节点@ID为键的信息字典，无匹配节点时为空字典
+        """
+        info = {}
+        field_items = tuple(fields.items())
+        for node in self._lookup(key):
+            if not isinstance(node, dict):
+                continue
+            get = node.get
+            cell = {name: get(src, default) for name, (src, default) in field_items}
+            if extra is not None:
+                cell.update(extra(node))
+            info[get("@ID")] = cell
+        return info
+
     def recursion_ext(self, need_ext_obj, ext_list, key):
         """
         递归提取XML对象中指定键的值
@@ -62,31 +279,5 @@ class FileParserBase(object):
         Returns:
             None: 直接修改ext_list参数，不返回值
         """
-        # 检查当前对象是否为字典类型
-        if isinstance(need_ext_obj, dict):
-            # 遍历字典中的所有键值对
-            for k, v in need_ext_obj.items():
-                # 如果当前键等于目标键
-                if k == key:
-                    # 根据值的类型进行不同处理
-                    if isinstance(v, (dict, str)):
-                        # 如果值是字典或字符串，直接添加到结果列表
-                        ext_list.append(v)
-                    elif isinstance(v, list):
-                        # 如果值是列表，将列表中的所有元素扩展到结果列表
-                        ext_list.extend(v)
-                else:
-                    # 如果当前键不是目标键，则继续递归搜索
-                    if isinstance(v, dict):
-                        # 如果值是字典，递归调用自身
-                        self.recursion_ext(v, ext_list, key)
-                    elif isinstance(v, list):
-                        # 如果值是列表，遍历列表中的每个元素并递归调用
-                        for cell in v:
-                            self.recursion_ext(cell, ext_list, key)
-                    else:
-                        # 其他类型则跳过
-                        pass
-        else:
-            # 如果传入的对象不是字典类型，打印其类型（可能是调试用途）
-            print(type(need_ext_obj))
+        # 委托给生成器版本，保持原有的"填充列表"接口不变
+        ext_list.extend(self.recursion_iter(need_ext_obj, key))
@@ -6,8 +6,15 @@
 # AUTHOR: reno
 # NOTE: PublicResFileParser
 
+import re
+
 from .file_parser_base import FileParserBase
 
+# 常见的字体样式后缀；多数CJK字体名不含任何样式词，可整体跳过替换
+_STYLES = ("Bold", "Italic", "Regular", "Light", "Medium")
+# 预编译的样式匹配正则，一次扫描即可判断是否存在样式词
+_STYLE_RE = re.compile("|".join(_STYLES))
+
 
 class PublicResFileParser(FileParserBase):
     """
@@ -40,16 +47,10 @@ class PublicResFileParser(FileParserBase):
             return ""
         # 移除字体名称中的空格
         normalized = font_name.replace(" ", "")
-        # 处理常见的字体样式后缀，将其转换为连字符格式
-        for style in [
-            "Bold",
-            "Italic",
-            "Regular",
-            "Light",
-            "Medium",
-        ]:
-            if style in normalized:
-                normalized = normalized.replace(style, f"-{style}")
+        # 处理常见的字体样式后缀，将其转换为连字符格式；
+        # 先用一次search短路：不含任何样式词的名称（多数CJK字体）直接跳过替换
+        if _STYLE_RE.search(normalized):
+            normalized = _STYLE_RE.sub(r"-\g<0>", normalized)
 
         # TODO 特殊字体名规范 后续存在需要完善
         # 特殊情况处理：将Times New Roman转换为Times-Roman
@@ -81,27 +82,27 @@ class PublicResFileParser(FileParserBase):
                 }
                 如果没有找到任何字体资源，则返回空字典
         """
-        info = {}  # 初始化存储字体信息的字典
-        public_res: list = []  # 存储找到的所有字体对象
-        public_res_key = "ofd:Font"  # 字体对象在XML中的标签名
-
-        # 递归查找XML中所有的ofd:Font节点，并将结果存入public_res列表
-        self.recursion_ext(self.xml_obj, public_res, public_res_key)
-
-        if public_res:  # 如果找到了字体对象
-            for i in public_res:  # 遍历每一个字体对象
-                info[i.get("@ID")] = {  # 使用字体ID作为键，存储相关信息
-                    "FontName": self.normalize_font_name(
-                        i.get("@FontName")
-                    ),  # 规范化后的字体名称
-                    "FontNameORI": i.get("@FontName"),  # 原始字体名称
-                    "FamilyName": self.normalize_font_name(
-                        i.get("@FamilyName")
-                    ),  # 规范化后的字体家族名称
-                    "FamilyNameORI": i.get("@FamilyName"),  # 原始字体家族名称
-                    "Bold": i.get("@Bold"),  # 是否为粗体
-                    "Serif": i.get("@Serif"),  # 是否为衬线字体
-                    "FixedWidth": i.get("@FixedWidth"),  # 是否为等宽字体
-                    "FontFile": i.get("ofd:FontFile"),  # 字体文件路径
-                }
-        return info  # 返回包含所有字体信息的字典
+        normalize = self.normalize_font_name  # 提前绑定，避免循环内重复属性查找
+
+        def normalized_names(font):
+            """计算规范化后的字体名称与家族名称"""
+            return {
+                "FontName": normalize(font.get("@FontName")),  # 规范化后的字体名称
+                "FamilyName": normalize(
+                    font.get("@FamilyName")
+                ),  # 规范化后的字体家族名称
+            }
+
+        # 查找所有的ofd:Font节点并批量抽取属性，以字体ID为键
+        return self._build_info_dict(
+            "ofd:Font",
+            {
+                "FontNameORI": ("@FontName", None),  # 原始字体名称
+                "FamilyNameORI": ("@FamilyName", None),  # 原始字体家族名称
+                "Bold": ("@Bold", None),  # 是否为粗体
+                "Serif": ("@Serif", None),  # 是否为衬线字体
+                "FixedWidth": ("@FixedWidth", None),  # 是否为等宽字体
+                "FontFile": ("ofd:FontFile", None),  # 字体文件路径
+            },
+            extra=normalized_names,
+        )  # 返回包含所有字体信息的字典
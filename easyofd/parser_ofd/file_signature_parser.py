@@ -41,21 +41,15 @@ class SignaturesFileParser(FileParserBase):
                 }
                 如果没有找到任何签章信息，则返回空字典
         """
-        info = {}  # 初始化存储签章信息的字典
-        signature_res: list = []  # 存储找到的所有签章对象
-        signature_res_key = "ofd:Signature"  # 签章对象在XML中的标签名
-
-        # 递归查找XML中所有的ofd:Signature节点，并将结果存入signature_res列表
-        self.recursion_ext(self.xml_obj, signature_res, signature_res_key)
-
-        if signature_res:  # 如果找到了签章对象
-            for i in signature_res:  # 遍历每一个签章对象
-                info[i.get("@ID")] = {  # 使用签章ID作为键，存储相关信息
-                    "BaseLoc": i.get("@BaseLoc"),  # 签章基础位置
-                    "Type": i.get("@Type"),  # 签章类型
-                    "ID": i.get("@ID"),  # 签章标识符
-                }
-        return info  # 返回包含所有签章信息的字典
+        # 查找所有的ofd:Signature节点并批量抽取属性，以签章ID为键
+        return self._build_info_dict(
+            "ofd:Signature",
+            {
+                "BaseLoc": ("@BaseLoc", None),  # 签章基础位置
+                "Type": ("@Type", None),  # 签章类型
+                "ID": ("@ID", None),  # 签章标识符
+            },
+        )  # 返回包含所有签章信息的字典
 
 
 class SignatureFileParser(FileParserBase):
@@ -92,15 +86,11 @@ class SignatureFileParser(FileParserBase):
                 如果没有找到签章信息，则返回空字典
         """
         info = {}  # 初始化存储签章信息的字典
-        StampAnnot_res: list = []  # 存储找到的所有签章注释对象
-        StampAnnot_res_key = "ofd:StampAnnot"  # 签章注释对象在XML中的标签名
-
-        # 递归查找XML中所有的ofd:StampAnnot节点，并将结果存入StampAnnot_res列表
-        self.recursion_ext(self.xml_obj, StampAnnot_res, StampAnnot_res_key)
+        # 查找XML中所有的ofd:StampAnnot节点（签章注释对象）
+        StampAnnot_res: list = self._lookup("ofd:StampAnnot")
 
-        SignedValue_res: list = []  # 存储找到的所有签名值对象
-        SignedValue_res_key = "ofd:SignedValue"  # 签名值对象在XML中的标签名
-        self.recursion_ext(self.xml_obj, SignedValue_res, SignedValue_res_key)
+        # 查找XML中所有的ofd:SignedValue节点（签名值对象）
+        SignedValue_res: list = self._lookup("ofd:SignedValue")
 
         # print("SignedValue_res", SignedValue_res)  # 注释掉的调试语句
         # print("prefix", prefix)  # 注释掉的调试语句
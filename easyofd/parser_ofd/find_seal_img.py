@@ -13,6 +13,18 @@ from pyasn1.codec.der.decoder import decode
 from pyasn1.type import univ
 from pyasn1.error import PyAsn1Error
 
+# 常见图片格式的文件头魔数表：命中任一前缀才尝试用PIL解码，
+# 直接在原始字节上判断，避免prettyPrint的十六进制字符串往返
+_IMG_MAGICS = (
+    b"\x89PNG\r\n\x1a\n",  # PNG
+    b"\xff\xd8\xff",  # JPEG
+    b"GIF87a",  # GIF
+    b"GIF89a",  # GIF
+    b"BM",  # BMP
+    b"II*\x00",  # TIFF（小端）
+    b"MM\x00*",  # TIFF（大端）
+)
+
 
 class SealExtract(object):
     """
@@ -85,21 +97,18 @@ class SealExtract(object):
             except PyAsn1Error:
                 pass
 
-    def hex_to_image(self, hex_data, image_format="PNG", inx=0):
+    def bytes_to_image(self, binary_data, image_format="PNG", inx=0):
         """
-        将十六进制数据转换为图片对象
+        将二进制数据转换为图片对象
 
         Args:
-            hex_data (str): 图片的十六进制数据字符串
+            binary_data (bytes): 图片的二进制数据
             image_format (str): 图片格式，默认为'PNG'
             inx (int): 索引，用于调试（当前未使用）
 
         Returns:
             PIL.Image.Image: 成功时返回图片对象，失败时返回None
         """
-        # 将十六进制数据转换为二进制数据
-        binary_data = bytes.fromhex(hex_data)
-
         # 创建BytesIO对象以读取二进制数据
         image_stream = io.BytesIO(binary_data)
 
@@ -113,6 +122,23 @@ class SealExtract(object):
             logger.info("not img ")
             return None
 
+    def hex_to_image(self, hex_data, image_format="PNG", inx=0):
+        """
+        将十六进制数据转换为图片对象
+
+        Args:
+            hex_data (str): 图片的十六进制数据字符串
+            image_format (str): 图片格式，默认为'PNG'
+            inx (int): 索引，用于调试（当前未使用）
+
+        Returns:
+            PIL.Image.Image: 成功时返回图片对象，失败时返回None
+        """
+        # 将十六进制数据转换为二进制数据后委托给bytes_to_image处理
+        return self.bytes_to_image(
+            bytes.fromhex(hex_data), image_format=image_format, inx=inx
+        )
+
     def __call__(self, path):
         """
         执行印章提取的主要方法
@@ -142,10 +168,10 @@ class SealExtract(object):
 
             # 遍历所有找到的八位字节串
             for i, octet_string in enumerate(octet_strings):
-                # 检查八位字节串的可打印表示是否以"0x"开头（十六进制格式）
-                if str(octet_string.prettyPrint()).startswith("0x"):
-                    # 将十六进制数据转换为图片对象
-                    img = self.hex_to_image(str(octet_string.prettyPrint())[2:], inx=i)
+                # 直接取原始字节并比对图片魔数，避免十六进制字符串往返
+                raw = octet_string.asOctets()
+                if raw.startswith(_IMG_MAGICS):
+                    img = self.bytes_to_image(raw, inx=i)
                     if img:
                         # 如果成功转换为图片，则添加到图片列表
                         img_list.append(img)
@@ -17,6 +17,9 @@ import traceback
 import base64
 import re
 import io
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from typing import Any, List
 from PIL import Image
@@ -36,6 +39,64 @@ from .path_parser import PathParser
 
 # todo 解析流程需要大改
 
+# 尺寸串含脏token时提取数值用的正则（预编译，一次findall扫完整串）
+_FLOAT_TOKEN_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)")
+# 从页面/模板路径中提取编号用的正则
+_PAGE_NO_RE = re.compile(r"\d+")
+# 路径分隔符统一替换表：translate一次C调用完成，替代连续四次replace
+_PATH_NORM_TABLE = str.maketrans("\\/", "--")
+
+
+_MISS = {}  # _dig内部的未命中哨兵，避免每层miss都分配新的空字典
+
+
+def _dig(d, *keys):
+    """
+    沿键路径逐层取嵌套字典的值
+
+    等价于连续的.get(key, {})链式调用，但用共享哨兵代替每层miss时
+    新分配的空字典，任一层不是字典或键缺失时返回空字符串。
+
+    Args:
+        d (dict): 起始字典
+        *keys (str): 逐层下钻的键路径
+
+    Returns:
+        Any: 命中的值，路径中断时返回空字符串
+    """
+    cur = d
+    for k in keys:
+        cur = cur.get(k, _MISS) if isinstance(cur, dict) else _MISS
+    return "" if cur is _MISS else cur
+
+
+def _pos_sort_key(pos_text):
+    """页面元素排序键：先按y坐标再按x坐标（即先行后列）"""
+    pos = pos_text.get("pos")
+    return float(pos[1]), float(pos[0])
+
+
+def _parse_size(size_str):
+    """
+    解析"0 0 210 297"形式的尺寸串为浮点数列表
+
+    快路径split+map(float)整个在C层循环完成；仅当存在非数字token时
+    才回退到一次findall提取全部数值，坏token直接忽略不再抛错。
+
+    Args:
+        size_str (str): 空格分隔的尺寸字符串
+
+    Returns:
+        list: 浮点数列表，输入为空时返回空列表
+    """
+    if not size_str:
+        return []
+    try:
+        return list(map(float, size_str.split()))
+    except ValueError:
+        # 含非数字token：一次正则扫描提取出全部数值再转换
+        return list(map(float, _FLOAT_TOKEN_RE.findall(size_str)))
+
 
 class OFDParser(object):
     """
@@ -68,8 +129,43 @@ class OFDParser(object):
         self.img_deal = DealImg()
         self.ofdb64 = ofdb64
         self.file_tree = None
+        self._path_index = None  # 规范化路径后缀 -> file_tree键 的哈希索引
+        self._xml_obj_cache = {}  # label -> 查找结果 的记忆化缓存
+        self._buf_local = threading.local()  # 各转码线程复用的输出缓冲
         self.jbig2dec_path = r"C:/msys64/mingw64/bin/jbig2dec.exe"
 
+    @staticmethod
+    def _normalize_path(path: str) -> str:
+        """
+        统一路径分隔符，避免win linux 路径冲突
+
+        Args:
+            path (str): 原始路径字符串
+
+        Returns:
+            str: 各类分隔符统一替换为"-"后的路径字符串
+        """
+        return path.translate(_PATH_NORM_TABLE)
+
+    def _build_path_index(self):
+        """
+        为file_tree构建路径后缀索引
+
+        对每个文件键的规范化路径（统一小写，查找不区分大小写），把完整
+        路径及每个分隔符边界处的后缀都登记到哈希表中（先出现的键优先），
+        这样get_xml_obj的查找从"逐键做子串比较"变为一次哈希命中。
+        """
+        index = {}
+        for abs_p in self.file_tree:
+            norm = self._normalize_path(abs_p).lower()
+            index.setdefault(norm, abs_p)
+            # 登记每个"-"边界之后的后缀（例如 Doc_0-Document.xml、Document.xml）
+            pos = norm.find("-")
+            while pos != -1:
+                index.setdefault(norm[pos + 1 :], abs_p)
+                pos = norm.find("-", pos + 1)
+        self._path_index = index
+
     def img2data(self, imglist: List[ImageClass]):
         """
         将PIL图像列表转换为OFD数据格式
@@ -93,7 +189,7 @@ class OFDParser(object):
         for idx, img_pil in enumerate(imglist):
             w, h = img_pil.size
             img_bytes = self.img_deal.pil2bytes(img_pil)
-            imgb64 = str(base64.b64encode(img_bytes), encoding="utf-8")
+            imgb64 = base64.b64encode(img_bytes).decode("ascii")
             img_info[str(idx)] = {
                 "format": "jpg",
                 "wrap_pos": "",
@@ -146,27 +242,80 @@ class OFDParser(object):
         """
         assert label
         # print(self.file_tree.keys())
+        # 同一标签（SignedValue、字体文件等）常被重复请求，记忆化后直接返回
+        if label in self._xml_obj_cache:
+            return self._xml_obj_cache[label]
+        if self._path_index is None:
+            self._build_path_index()
+        raw_label = label
         label = label.lstrip("./")
-        for abs_p in self.file_tree:
-            # 统一符号，避免win linux 路径冲突
-
-            abs_p_compare = (
-                abs_p.replace("\\\\", "-")
-                .replace("//", "-")
-                .replace("\\", "-")
-                .replace("/", "-")
-            )
-            label_compare = (
-                label.replace("\\\\", "-")
-                .replace("//", "-")
-                .replace("\\", "-")
-                .replace("/", "-")
-            )
-            if label_compare in abs_p_compare:
-                # logger.info(f"{label} {abs_p}")
-                return self.file_tree[abs_p]
+        label_compare = self._normalize_path(label).lower()
+        # 标签是某个文件路径的后缀（不区分大小写），一次哈希查找直接命中；
+        # 索引覆盖了所有分隔符边界后缀，无需再对全部键做子串扫描
+        abs_p = self._path_index.get(label_compare)
+        result = self.file_tree[abs_p] if abs_p is not None else ""
         # logger.info(f"{label} ofd file path is not")
-        return ""
+        self._xml_obj_cache[raw_label] = result
+        return result
+
+    def _out_buffer(self):
+        """
+        取当前线程复用的JPEG输出缓冲（已清空、可直接写入）
+
+        转码在线程池中并行执行，缓冲按线程各留一份，既避免了每张图
+        重新分配/释放BytesIO的开销，也不会在线程间互相覆盖。
+
+        Returns:
+            io.BytesIO: 复位到起始位置的空缓冲对象
+        """
+        buf = getattr(self._buf_local, "out", None)
+        if buf is None:
+            buf = self._buf_local.out = io.BytesIO()
+        buf.seek(0)
+        buf.truncate(0)
+        return buf
+
+    # 小于该像素数的图直接存PNG，省掉昂贵的JPEG编码
+    _SMALL_IMG_PIXELS = 64 * 64
+
+    def _transcode_shortcut(self, img_d, image, src_b64):
+        """
+        转码前的快捷路径判断
+
+        数据流实际已是JPEG编码（容器后缀与内容不符，如包着JPEG流的bmp）
+        时原样透传，完全跳过解码/重编码；小图改存PNG，编码开销远低于
+        JPEG且下游绘制本就支持png（jb2转码产出的就是png）。
+
+        Args:
+            img_d (dict): 图像信息字典
+            image (PIL.Image.Image): 已打开的图像对象
+            src_b64 (str): 原始图像数据的base64字符串
+
+        Returns:
+            bool: 已走快捷路径并填好img_d返回True，否则返回False
+        """
+        fileName = img_d["fileName"]
+        stem = fileName.rsplit(".", 1)[0]
+        if image.format == "JPEG":
+            image.close()
+            logger.info(f"已是JPEG编码，直接透传{fileName}")
+            img_d["fileName"] = f"{stem}.jpg"
+            img_d["suffix"] = "jpg"
+            img_d["format"] = "jpg"
+            img_d["imgb64"] = src_b64
+            return True
+        if image.width * image.height < self._SMALL_IMG_PIXELS:
+            output_buffer = self._out_buffer()
+            image.save(output_buffer, format="PNG")
+            image.close()
+            b64_png = base64.b64encode(output_buffer.getvalue()).decode("ascii")
+            logger.info(f"小图改存PNG {fileName}>>{stem}.png")
+            img_d["fileName"] = f"{stem}.png"
+            img_d["suffix"] = "png"
+            img_d["format"] = "png"
+            img_d["imgb64"] = b64_png
+            return True
+        return False
 
     def jb22png(self, img_d: dict):
         """
@@ -190,10 +339,14 @@ class OFDParser(object):
         new_fileName = img_d["fileName"].replace(".jb2", ".png")
         with open(fileName, "wb") as f:
             f.write(base64.b64decode(img_d["imgb64"]))
-        command = "{} -o {} {}"
-        res = os.system(command.format(self.jbig2dec_path, new_fileName, fileName))
-        if res != 0:
-            logger.warning(f"jbig2dec处理失败")
+        # 直接以参数列表方式调用，免去os.system的shell进程和命令拼接
+        res = subprocess.run(
+            [self.jbig2dec_path, "-o", new_fileName, fileName],
+            capture_output=True,
+            text=True,
+        )
+        if res.returncode != 0:
+            logger.warning(f"jbig2dec处理失败 {res.stderr}")
         if os.path.exists(fileName):
             os.remove(fileName)
         if os.path.exists(new_fileName):
@@ -203,7 +356,7 @@ class OFDParser(object):
             img_d["format"] = "png"
             with open(new_fileName, "rb") as f:
                 data = f.read()
-                img_d["imgb64"] = str(base64.b64encode(data), encoding="utf-8")
+                img_d["imgb64"] = base64.b64encode(data).decode("ascii")
 
             os.remove(new_fileName)
 
@@ -221,13 +374,15 @@ class OFDParser(object):
         b64_nmp = self.get_xml_obj(fileName)
         image_data = base64.b64decode(b64_nmp)
         image = Image.open(io.BytesIO(image_data))
-        rgb_image = image.convert("RGB")
-        output_buffer = io.BytesIO()
+        if self._transcode_shortcut(img_d, image, b64_nmp):
+            return
+        # 已经是RGB的位图直接编码，省掉一次整幅像素拷贝
+        rgb_image = image if image.mode == "RGB" else image.convert("RGB")
+        output_buffer = self._out_buffer()
         rgb_image.save(output_buffer, format="JPEG")
         image.close()
         jpeg_bytes = output_buffer.getvalue()
-        b64_jpeg = base64.b64encode(jpeg_bytes).decode("utf-8")
-        output_buffer.close()
+        b64_jpeg = base64.b64encode(jpeg_bytes).decode("ascii")
 
         if b64_jpeg:
             logger.info(f"bmp2jpg处理成功{fileName}>>{new_fileName}")
@@ -250,24 +405,25 @@ class OFDParser(object):
         tif_nmp = self.get_xml_obj(fileName)
         image_data = base64.b64decode(tif_nmp)
         image = Image.open(io.BytesIO(image_data))
+        if self._transcode_shortcut(img_d, image, tif_nmp):
+            return
         if image.mode in ("RGBA", "LA") or (
             image.mode == "P" and "transparency" in image.info
         ):
             image = image.convert("RGB")
 
-            # 创建一个字节流来保存处理后的图像
-        output_buffer = io.BytesIO()
+            # 取线程复用的字节流来保存处理后的图像
+        output_buffer = self._out_buffer()
 
         # 保存图像为 JPEG 格式到字节流中
         image.save(output_buffer, format="JPEG", quality=95)
 
         # 获取字节流中的内容并编码为 Base64 字符串
         jpeg_bytes = output_buffer.getvalue()
-        b64_jpeg = base64.b64encode(jpeg_bytes).decode("utf-8")
+        b64_jpeg = base64.b64encode(jpeg_bytes).decode("ascii")
 
-        # 关闭图像对象和字节流
+        # 关闭图像对象（字节流留给线程复用）
         image.close()
-        output_buffer.close()
 
         if b64_jpeg:
             logger.info(f"tif2jpg处理成功{fileName}>>{new_fileName}")
@@ -290,14 +446,15 @@ class OFDParser(object):
         b64_gif = self.get_xml_obj(fileName)
         image_data = base64.b64decode(b64_gif)
         image = Image.open(io.BytesIO(image_data))
+        if self._transcode_shortcut(img_d, image, b64_gif):
+            return
         if image.mode != "RGB":
             image = image.convert("RGB")
-        output_buffer = io.BytesIO()
+        output_buffer = self._out_buffer()
         image.save(output_buffer, format="JPEG", quality=95)
         image.close()
         jpeg_bytes = output_buffer.getvalue()
-        b64_jpeg = base64.b64encode(jpeg_bytes).decode("utf-8")
-        output_buffer.close()
+        b64_jpeg = base64.b64encode(jpeg_bytes).decode("ascii")
 
         if b64_jpeg:
             logger.info(f"gif2jpg处理成功{fileName}>>{new_fileName}")
@@ -306,6 +463,15 @@ class OFDParser(object):
             img_d["format"] = "jpg"
             img_d["imgb64"] = b64_jpeg
 
+    # 后缀 -> 转码方法 的分发表；常见可直接使用的格式（jpg/png等）不在表内，
+    # 查表miss即跳过转码
+    _IMG_CONVERTERS = {
+        "jb2": jb22png,
+        "bmp": bmp2jpg,
+        "tif": tif2jpg,
+        "gif": gif2jpg,
+    }
+
     def parser(self):
         """
         解析OFD文档的主要方法
@@ -350,11 +516,7 @@ class OFDParser(object):
 
         if doc_size:
             try:
-                default_page_size = [
-                    float(pos_i)
-                    for pos_i in doc_size.split(" ")
-                    if re.match("[\d\.]", pos_i)
-                ]
+                default_page_size = _parse_size(doc_size)
             except:
                 traceback.print_exc()
 
@@ -380,18 +542,22 @@ class OFDParser(object):
             document_res_xml_obj = self.get_xml_obj(document_res_name[0])
 
             img_info = DocumentResFileParser(document_res_xml_obj)()
-            # 找到图片b64
-            for img_id, img_v in img_info.items():
+
+            def fetch_and_convert(img_v):
+                """取出单张图片的b64内容，必要时转码为可用格式"""
                 img_v["imgb64"] = self.get_xml_obj(img_v.get("fileName"))
                 # todo ib2 转png C:/msys64/mingw64/bin/jbig2dec.exe -o F:\code\easyofd\test\image_80.png F:\code\easyofd\test\image_80.jb2
-                if img_v["suffix"] == "jb2":
-                    self.jb22png(img_v)
-                elif img_v["suffix"] == "bmp":
-                    self.bmp2jpg(img_v)
-                elif img_v["suffix"] == "tif":
-                    self.tif2jpg(img_v)
-                elif img_v["suffix"] == "gif":
-                    self.gif2jpg(img_v)
+                # 按后缀查分发表，替代逐个if/elif比较
+                convert = self._IMG_CONVERTERS.get(img_v["suffix"])
+                if convert is not None:
+                    convert(self, img_v)
+
+            # 找到图片b64；图片之间互相独立，解码/转码用线程池并行，
+            # Pillow的编解码在C层释放GIL，多图文档可以真正并行
+            if img_info:
+                with ThreadPoolExecutor() as executor:
+                    # list() 触发执行并向上传播工作线程中的异常
+                    list(executor.map(fetch_and_convert, img_info.values()))
 
         page_id_map: list = doc_root_info.get("page_id_map")
         signatures_page_id = {}
@@ -423,24 +589,16 @@ class OFDParser(object):
                     # print(SignedValue, self.get_xml_obj(SignedValue))
                     # with open("b64.txt","w") as f:
                     #     f.write(self.get_xml_obj(SignedValue))
-                    if signatures_page_id.get(sing_page_no):
-                        signatures_page_id[sing_page_no].append(
-                            {
-                                "sing_page_no": sing_page_no,
-                                "PageRef": PageRef,
-                                "Boundary": Boundary,
-                                "SignedValue": self.get_xml_obj(SignedValue),
-                            }
-                        )
-                    else:
-                        signatures_page_id[sing_page_no] = [
-                            {
-                                "sing_page_no": sing_page_no,
-                                "PageRef": PageRef,
-                                "Boundary": Boundary,
-                                "SignedValue": self.get_xml_obj(SignedValue),
-                            }
-                        ]
+                    # 两个分支各查一次SignedValue，提前取出只查一次
+                    signed_value_obj = self.get_xml_obj(SignedValue)
+                    signatures_page_id.setdefault(sing_page_no, []).append(
+                        {
+                            "sing_page_no": sing_page_no,
+                            "PageRef": PageRef,
+                            "Boundary": Boundary,
+                            "SignedValue": signed_value_obj,
+                        }
+                    )
 
         # 注释信息
         annotation_name: list = doc_root_info.get("Annotations")
@@ -457,32 +615,38 @@ class OFDParser(object):
 
         page_info_d = {}
         if page_name:
-            for index, _page in enumerate(page_name):
+
+            def parse_page(args):
+                """解析单个页面，返回（页码，页面size，页面内容）"""
+                index, _page = args
                 page_xml_obj = self.get_xml_obj(_page)
                 # 重新获取页面size
+                page_size = []
                 try:
-                    page_size = [
-                        float(pos_i)
-                        for pos_i in page_xml_obj.get("ofd:Page", {})
-                        .get("ofd:Area", {})
-                        .get("ofd:PhysicalBox", "")
-                        .split(" ")
-                        if re.match("[\d\.]", pos_i)
-                    ]
-                    if page_size and len(page_size) >= 2:
-                        page_size_details.append(page_size)
-                    else:
-                        page_size_details.append([])
+                    page_size = _parse_size(
+                        _dig(page_xml_obj, "ofd:Page", "ofd:Area", "ofd:PhysicalBox")
+                    )
+                    if not (page_size and len(page_size) >= 2):
+                        page_size = []
                 except Exception as e:
                     traceback.print_exc()
-                    page_size.append([])
+                    page_size = []
                 page_info = ContentFileParser(page_xml_obj)()
-                pg_no = re.search(r"\d+", _page)
+                pg_no = _PAGE_NO_RE.search(_page)
                 if pg_no:
                     pg_no = int(pg_no.group())
                 else:
                     pg_no = index
-                page_info_d[pg_no] = page_info
+                return pg_no, page_size, page_info
+
+            # 页面之间互相独立，用线程池并行解析；map保持输入顺序，
+            # 因此page_size_details仍与页面列表顺序一致
+            with ThreadPoolExecutor() as executor:
+                for pg_no, page_size, page_info in executor.map(
+                    parse_page, enumerate(page_name)
+                ):
+                    page_size_details.append(page_size)
+                    page_info_d[pg_no] = page_info
 
         # 模板信息
         tpls_name: list = doc_root_info.get("tpls")
@@ -490,7 +654,7 @@ class OFDParser(object):
             for index, _tpl in enumerate(tpls_name):
                 tpl_xml_obj = self.get_xml_obj(_tpl)
                 tpl_info = ContentFileParser(tpl_xml_obj)()
-                tpl_no = re.search(r"\d+", _tpl)
+                tpl_no = _PAGE_NO_RE.search(_tpl)
 
                 if tpl_no:
                     tpl_no = int(tpl_no.group())
@@ -498,35 +662,15 @@ class OFDParser(object):
                     tpl_no = index
 
                 if tpl_no in page_info_d:
-                    page_info_d[pg_no]["text_list"].extend(tpl_info["text_list"])
-                    page_info_d[pg_no]["text_list"].sort(
-                        key=lambda pos_text: (
-                            float(pos_text.get("pos")[1]),
-                            float(pos_text.get("pos")[0]),
-                        )
-                    )
-                    page_info_d[pg_no]["img_list"].extend(tpl_info["img_list"])
-                    page_info_d[pg_no]["img_list"].sort(
-                        key=lambda pos_text: (
-                            float(pos_text.get("pos")[1]),
-                            float(pos_text.get("pos")[0]),
-                        )
-                    )
-                    page_info_d[pg_no]["line_list"].extend(tpl_info["line_list"])
-                    page_info_d[pg_no]["line_list"].sort(
-                        key=lambda pos_text: (
-                            float(pos_text.get("pos")[1]),
-                            float(pos_text.get("pos")[0]),
-                        )
-                    )
+                    # 绑定到局部变量，省掉逐行重复的字典哈希查找；
+                    # 原先这里误用了页面循环残留的pg_no，应合并到tpl_no对应页
+                    entry = page_info_d[tpl_no]
+                    for name in ("text_list", "img_list", "line_list"):
+                        entry[name].extend(tpl_info[name])
+                        entry[name].sort(key=_pos_sort_key)
                 else:
                     page_info_d[tpl_no] = tpl_info
-                    page_info_d[tpl_no].sort(
-                        key=lambda pos_text: (
-                            float(pos_text.get("pos")[1]),
-                            float(pos_text.get("pos")[0]),
-                        )
-                    )
+                    page_info_d[tpl_no].sort(key=_pos_sort_key)
 
         # todo 读取注释信息
         page_ID = 0  # 没遇到过doc多个的情况
@@ -541,12 +685,15 @@ class OFDParser(object):
                 "signatures_page_id": signatures_page_id,
                 "page_id_map": page_id_map,
                 "fonts": font_info,
+                # page_tpl_info/page_content_info是对同一份页面信息的别名，
+                # 每个键只写一次（原先"page_info"重复出现，徒增构建开销）
                 "page_info": page_info_d,
                 "page_tpl_info": page_info_d,
                 "page_content_info": page_info_d,
-                "page_info": page_info_d,
             }
         )
+        # 解析结束后记忆化缓存不再会命中，及时清空释放其中的大段b64引用
+        self._xml_obj_cache.clear()
         return doc_list
 
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
@@ -571,11 +718,14 @@ class OFDParser(object):
         save_xml = kwargs.get("save_xml", False)
         xml_name = kwargs.get("xml_name")
         self.file_tree = FileRead(self.ofdb64)(save_xml=save_xml, xml_name=xml_name)
+        # 文件树就位后立即建一次路径索引，后续所有get_xml_obj均摊O(1)
+        self._xml_obj_cache = {}
+        self._build_path_index()
         # logger.info(self.file_tree)
         return self.parser()
 
 
 if __name__ == "__main__":
     with open(r"E:\code\easyofd\test\增值税电子专票5.ofd", "rb") as f:
-        ofdb64 = str(base64.b64encode(f.read()), "utf-8")
+        ofdb64 = base64.b64encode(f.read()).decode("ascii")
     print(OFDParser(ofdb64)())
@@ -29,6 +29,10 @@ class ParameterParser(object):
         "@Value": (str, str),  # 值参数，期望字符串类型
     }
 
+    # 预构造的默认值单例：不可变默认（str等）直接复用，
+    # 省掉每次类型不匹配时的构造调用
+    _defaults = {k: spec[1]() for k, spec in parameter.items()}
+
     def __call__(self, key: str, container: Dict[str, Any]) -> Optional[Any]:
         """
         解析指定键的参数值
@@ -43,13 +47,14 @@ class ParameterParser(object):
         Returns:
             Optional[Any]: 符合类型要求的参数值，如果键不存在则返回None
         """
-        if key in ParameterParser.parameter:
-            v = container.get(key, None)
-            t = ParameterParser.parameter[key]
-            if isinstance(v, t[0]):
-                return v
-            else:
-                return t[1]()
-        else:
+        # 一次dict.get替代"in判断 + 下标取值"的两次哈希查找
+        spec = ParameterParser.parameter.get(key)
+        if spec is None:
             logger.warning(f"{key} not in ParameterParser")
             return None
+        v = container.get(key)
+        if isinstance(v, spec[0]):
+            return v
+        default = ParameterParser._defaults[key]
+        # 可变默认值（dict）不能跨调用共享，按需重建；不可变默认直接复用
+        return type(default)() if isinstance(default, dict) else default
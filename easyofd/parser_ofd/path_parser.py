@@ -53,6 +53,11 @@ class PathParser:
             self.os = "nt"
         else:
             self.os = "posix"
+        # 分隔符替换表：translate一次C调用完成，替代按操作系统分支的replace
+        if self.os == "nt":
+            self._sep_table = str.maketrans("/", "\\")
+        else:
+            self._sep_table = str.maketrans("\\", "/")
 
         self.root_path = self.format_path(root_path)
 
@@ -68,11 +73,7 @@ class PathParser:
         Returns:
             str: 格式化后的路径字符串
         """
-        normalized = os.path.normpath(path)
-        if self.os == "nt":
-            return normalized.replace("/", "\\")
-        else:
-            return normalized.replace("\\", "/")
+        return os.path.normpath(path).translate(self._sep_table)
 
     def get_path_type(self, path: str) -> PathType:
         """
@@ -105,18 +106,14 @@ class PathParser:
         """
         loc_path is posix style
         """
-        path_type = self.get_path_type(loc_path)
-        if path_type == PathType.absolutely:
+        # 绝对路径直接格式化返回，相对路径只确定一次(基准目录, 尾段)再拼接，
+        # 避免每个分支重复调用format_path/os.path.join
+        if os.path.isabs(loc_path):
             return self.format_path(loc_path)
-        if path_type == PathType.relative:
-            if loc_path.startswith("./"):
-                path = os.path.join(cur_path, self.format_path(loc_path[2:]))
-            elif loc_path.startswith("../"):
-                path = os.path.join(
-                    os.path.dirname(cur_path), self.format_path(loc_path[3:])
-                )
-            else:
-                path = os.path.join(
-                    os.path.dirname(cur_path), self.format_path(loc_path)
-                )
-            return path
+        if loc_path.startswith("./"):
+            base, tail = cur_path, loc_path[2:]
+        elif loc_path.startswith("../"):
+            base, tail = os.path.dirname(cur_path), loc_path[3:]
+        else:
+            base, tail = os.path.dirname(cur_path), loc_path
+        return os.path.join(base, self.format_path(tail))
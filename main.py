@@ -1,49 +1,163 @@
 # main.py
 import sys
 import os
-import base64
+import stat
+import mmap
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from PyQt5.QtWidgets import QApplication, QMainWindow, QFileDialog, QMessageBox
-from PyQt5.QtCore import pyqtSlot, QObject, QEvent
-from easyofd import OFD
+from PyQt5.QtCore import pyqtSlot, pyqtSignal, QObject, QEvent, QThread, QTimer
 from main_ui import (
     Ui_MainWindow,
 )  # 确保 main_ui.py 是用 pyuic5 -x main.ui -o main_ui.py 生成的
 from loguru import logger
 
+# 支持的扩展名（小写），endswith/成员判断都直接用这个元组
+_PDF_OFD = (".pdf", ".ofd")
+
+
+def _convert_one(path):
+    """
+    转换单个文件并写出结果（批量模式在工作进程中调用）
+
+    成功返回输出文件路径；不支持的扩展名或输出已存在时跳过，返回空串。
+    """
+    from easyofd import OFD
+
+    base, ext = os.path.splitext(path)
+    ext = ext.lower()
+    if ext not in _PDF_OFD:
+        return ""
+    output = base + (".ofd" if ext == ".pdf" else ".pdf")
+    if os.path.isfile(output):
+        return ""
+    # 整文件一次读完，不走BufferedReader（省掉8 KiB缓冲对象和多余seek）
+    with open(path, "rb", buffering=0) as f:
+        data = f.read()
+    ofd = OFD()
+    if ext == ".pdf":
+        out_bytes = ofd.pdf2ofd(data)
+    else:
+        ofd.read(data, fmt="binary")
+        out_bytes = ofd.to_pdf()
+    with open(output, "wb", buffering=1 << 20) as f:
+        if isinstance(out_bytes, (list, tuple)):
+            for chunk in out_bytes:
+                f.write(chunk)
+        else:
+            f.write(out_bytes)
+    return output
+
+
+def _load_ofd():
+    # easyofd连带fitz/reportlab/fontTools等重量级依赖，放到后台线程导入
+    # 并构造，主窗口不必等它们加载完就能显示
+    from easyofd import OFD
+
+    return OFD()
+
+
+class ConvertWorker(QObject):
+    # 转换在后台线程执行，完成/出错通过信号回到主线程刷新界面
+    finished = pyqtSignal(str)  # 携带输出文件路径
+    error = pyqtSignal(str)  # 携带错误提示
+
+    def __init__(self, owner, path, output, ext, read_future):
+        super().__init__()
+        self.owner = owner  # MainWindow，复用其读写方法与OFD实例
+        self.path = path
+        self.output = output
+        self.ext = ext
+        self.read_future = read_future  # 点击时即已提交的预读任务
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            # 磁盘读取在点击转换时就已在线程池中开始，这里只等结果，
+            # 读盘与QThread启动/界面刷新重叠进行
+            if self.ext == ".pdf":
+                pfdbyte = self.read_future.result()
+                ofd_byte = self.owner.ofd.pdf2ofd(pfdbyte)
+                self.owner.save_file(self.output, ofd_byte)
+                logger.info("PDF转OFD模式： {} completed", self.output)
+            else:
+                ofd_bytes = self.read_future.result()
+                self.owner.ofd.read(ofd_bytes, fmt="binary")
+                pdf_bytes = self.owner.ofd.to_pdf()
+                self.owner.save_file(self.output, pdf_bytes)
+                logger.info("OFD转PDF模式： {} completed", self.output)
+            self.finished.emit(self.output)
+        except Exception as e:
+            if self.ext == ".pdf":
+                logger.exception("PDF 转 OFD 出错:{}", e)
+                self.error.emit("PDF转OFD出错！")
+            else:
+                logger.exception("OFD 转 PDF 转换出错:{}", e)
+                self.error.emit("OFD 转 PDF 转换出错！")
+
 
 class MainWindow(QMainWindow, Ui_MainWindow):
     def __init__(self):
         super().__init__()
         self.setupUi(self)
-        self.ofd = OFD()
+        self._last_btn_text = None
+        self._ext_cache = ("", "")
+        self._io_pool = ThreadPoolExecutor(max_workers=2)  # 预读等I/O任务用
+        self._ofd_future = self._io_pool.submit(_load_ofd)
+        # textChanged逐字符触发按钮文案刷新，改为100ms去抖，连续输入/粘贴
+        # 只在停顿后刷新一次
+        self.file_path.textChanged.disconnect(self.update_convert_button_text)
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(100)
+        self._debounce.timeout.connect(self.update_convert_button_text)
+        self.file_path.textChanged.connect(lambda _: self._debounce.start())
         self.update_convert_button_text()
         # 允许 QLineEdit 接受拖拽
         self.file_path.setAcceptDrops(True)
         # 安装事件过滤器
         self.file_path.installEventFilter(self)
 
+    # 过滤器只关心的两类拖拽事件（类属性缓存，免去逐事件的属性解析）
+    _DRAG_EVENTS = (QEvent.DragEnter, QEvent.Drop)
+
     def eventFilter(self, obj, event):
-        if obj is self.file_path:
-            if event.type() == QEvent.DragEnter:
-                mime = event.mimeData()
-                if mime.hasUrls():
-                    self.file_path.clear()
-                    event.acceptProposedAction()
-                    return True
+        # 其余事件（包括拖动过程中的大量DragMove/鼠标事件）直接放行
+        if obj is not self.file_path or event.type() not in self._DRAG_EVENTS:
+            return super().eventFilter(obj, event)
 
-            elif event.type() == QEvent.Drop:
-                mime = event.mimeData()
-                if mime.hasUrls():
-                    file_path = mime.urls()[0].toLocalFile()
-                    self.file_path.setText(file_path)
+        mime = event.mimeData()
+        if mime.hasUrls():
+            if event.type() == QEvent.Drop:
+                urls = mime.urls()
+                if len(urls) > 1:
+                    # 一次拖入多个文件直接进入批量转换
+                    self.batch_convert([u.toLocalFile() for u in urls])
                     event.acceptProposedAction()
                     return True
+                file_path = urls[0].toLocalFile()
+                # 屏蔽textChanged信号，落点只显式触发一次按钮刷新
+                self.file_path.blockSignals(True)
+                self.file_path.setText(file_path)
+                self.file_path.blockSignals(False)
+                self.update_convert_button_text(file_path)
+            event.acceptProposedAction()
+            return True
 
         return super().eventFilter(obj, event)
 
-    def check_file(self, name, endswith: str):
-        if name.lower().endswith(endswith):
-            return True
+    @property
+    def ofd(self):
+        # 后台预加载未完成时在此等待；通常窗口显示后早已就绪
+        return self._ofd_future.result()
+
+    def _ext(self, path):
+        # 同一路径的小写扩展名只计算一次：按钮刷新、转换、路径换算都会问到
+        cached_path, cached_ext = self._ext_cache
+        if cached_path == path:
+            return cached_ext
+        ext = os.path.splitext(path)[1].lower()
+        self._ext_cache = (path, ext)
+        return ext
 
     def save_img(self, name, img_np):
         for inx, img in enumerate(img_np):
@@ -51,42 +165,63 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             img.save(name.format(inx))
 
     def save_file(self, name, _bytes):
-        with open(name, "wb") as f:
-            if isinstance(_bytes, list):
-                _bytes = _bytes[0]
-            f.write(_bytes)
+        # 1 MiB写缓冲：大文件输出时减少小块write系统调用
+        with open(name, "wb", buffering=1 << 20) as f:
+            if isinstance(_bytes, (list, tuple)):
+                # 分块输出逐段写入：原先只取第一段会丢掉后续内容，
+                # 逐段写也免去拼接整块的临时大拷贝
+                for chunk in _bytes:
+                    f.write(chunk)
+            else:
+                f.write(_bytes)
 
     def read_ofd(self, path):
-        with open(path, "rb") as f:
-            ofdb64 = str(base64.b64encode(f.read()), "utf-8")
-        return ofdb64
+        # 直接返回原始字节，easyofd按binary格式读取，省去base64编解码往返；
+        # 按文件大小预分配缓冲后分块readinto，读取全程只有这一份拷贝
+        size = os.path.getsize(path)
+        buf = bytearray(size)
+        view = memoryview(buf)
+        pos = 0
+        with open(path, "rb", buffering=0) as f:
+            while pos < size:
+                n = f.readinto(view[pos:])
+                if not n:
+                    break
+                pos += n
+        return buf if pos == size else buf[:pos]
 
     def read_pfd(self, path):
+        # mmap零拷贝映射页缓存，内容按需缺页读入，不再整文件复制进用户态；
+        # fitz不接受裸mmap对象，包一层memoryview即可直接作为stream使用
         with open(path, "rb") as f:
-            pfd_byte = f.read()
-        return pfd_byte
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
 
-    def swap_pdf_ofd_path(self, file_path: str) -> str:
+    def swap_pdf_ofd_path(self, file_path: str, ext: str = None) -> str:
         if not isinstance(file_path, str):
             raise TypeError("file_path 必须是字符串")
 
-        base, ext = os.path.splitext(file_path)
-        ext_lower = ext.lower()
+        if ext is None:
+            ext = self._ext(file_path)
+        base = os.path.splitext(file_path)[0]
 
-        if ext_lower == ".pdf":
+        if ext == ".pdf":
             return base + ".ofd"
-        elif ext_lower == ".ofd":
+        elif ext == ".ofd":
             return base + ".pdf"
         else:
             raise ValueError(f"不支持的文件扩展名: '{ext}'，仅支持 .pdf 或 .ofd")
 
     @pyqtSlot()
     def select_file(self):
+        # 不解析符号链接、不取自定义目录图标：目录很大或在网络盘上时
+        # 省掉对话框逐文件的stat/图标查询，打开明显变快
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "选择文件",
             "",
             "PDF/OFD 文件 (*.pdf *.ofd);;PDF 文件 (*.pdf);;OFD 文件 (*.ofd);;所有文件 (*)",
+            options=QFileDialog.DontResolveSymlinks
+            | QFileDialog.DontUseCustomDirectoryIcons,
         )
         if file_path:
             self.file_path.setText(file_path)
@@ -97,20 +232,17 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         if file_path is None:
             file_path = self.file_path.text().strip()
 
+        text = "转换文件"
         if file_path:
-            ext = os.path.splitext(file_path)[1].lower()
+            ext = self._ext(file_path)
             if ext == ".ofd":
-                self.convertButton.setText("转换为 PDF")
-                # self.convertImageButton.setText("转换为 PDF(图片方式)")
+                text = "转换为 PDF"
             elif ext == ".pdf":
-                self.convertButton.setText("转换为 OFD")
-                # self.convertImageButton.setText("转换为 OFD(图片方式)")
-            else:
-                self.convertButton.setText("转换文件")
-                # self.convertImageButton.setText("转换文件(图片方式)")
-        else:
-            self.convertButton.setText("转换文件")
-            # self.convertImageButton.setText("转换文件(图片方式)")
+                text = "转换为 OFD"
+        # 文案没变就不再setText，省掉多余的样式重算/重绘事件
+        if text != self._last_btn_text:
+            self.convertButton.setText(text)
+            self._last_btn_text = text
 
     @pyqtSlot()
     def convert_file(self):
@@ -119,67 +251,107 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             QMessageBox.warning(self, "警告", "请先选择一个文件！")
             return
 
-        if not os.path.isfile(path):
+        # 一次stat完成存在性+普通文件判断（isfile每次都是一个stat系统调用，
+        # 网络盘上尤其慢）
+        try:
+            st = os.stat(path)
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
             QMessageBox.critical(self, "错误", "所选文件不存在！")
             return
 
-        msg = ""
-        ext = os.path.splitext(path)[1].lower()
+        ext = self._ext(path)
+        if ext not in _PDF_OFD:
+            QMessageBox.warning(self, "不支持", "仅支持 .pdf 或 .ofd 文件！")
+            self.statusbar.showMessage("仅支持 .pdf 或 .ofd 文件！")
+            return
         if ext == ".pdf":
-            try:
-                logger.info(f"将 {path} 转换为 OFD 文件!")
-                self.statusbar.showMessage(f"开始转换...", 3000)
-                output = self.swap_pdf_ofd_path(path)
-                if os.path.isfile(output):
-                    QMessageBox.critical(self, "错误", "OFD文件存在！")
-                    return
-
-                pfdbyte = self.read_pfd(path)
-                ofd_byte = self.ofd.pdf2ofd(pfdbyte)
-                self.save_file(output, ofd_byte)
-                logger.info(f"PDF转OFD模式： {output} completed")
-                msg = f"{output} 转换完成！"
-                self.statusbar.showMessage(f"{output} 转换完成!")
-            except Exception as e:
-                logger.exception(f"PDF 转 OFD 出错:{e}")
-                self.statusbar.showMessage("PDF转OFD出错！")
-                QMessageBox.critical(self, "错误", "PDF转OFD出错！")
-                return
+            logger.info("将 {} 转换为 OFD 文件!", path)
+        else:
+            logger.info("将 {} 转换为 PDF 文件!", path)
 
-        elif ext == ".ofd":
-            try:
-                logger.info(f"将 {path} 转换为 PDF 文件!")
-                self.statusbar.showMessage("开始转换...")
-
-                output = self.swap_pdf_ofd_path(path)
-                if os.path.isfile(output):
-                    QMessageBox.critical(self, "错误", "PDF文件存在！")
-                    return
-
-                ofdb64 = self.read_ofd(path)
-                self.ofd.read(ofdb64)
-                pdf_bytes = self.ofd.to_pdf()
-                self.save_file(output, pdf_bytes)
-                logger.info(f"OFD转PDF模式： {output} completed")
-                self.statusbar.showMessage(f"{output} 转换完成!")
-                msg = f"{output} 转换完成！"
-            except Exception as e:
-                logger.exception(f"OFD 转 PDF 转换出错:{e}")
-                self.statusbar.showMessage("OFD 转 PDF 转换出错！")
-                QMessageBox.critical(self, "错误", "OFD 转 PDF 转换出错！")
-
-                return
+        output = self.swap_pdf_ofd_path(path, ext)
+        # lexists一次lstat即可，不跟随符号链接
+        if os.path.lexists(output):
+            QMessageBox.critical(
+                self, "错误", "OFD文件存在！" if ext == ".pdf" else "PDF文件存在！"
+            )
+            return
 
-        else:
+        # 转换放到后台线程执行，主线程的事件循环继续响应重绘/拖拽，
+        # 大文件转换时界面不再假死
+        self.convertButton.setEnabled(False)
+        self.statusbar.showMessage("开始转换...")
+        # 立即提交预读任务，磁盘I/O与下面的线程创建并行
+        reader = self.read_pfd if ext == ".pdf" else self.read_ofd
+        read_future = self._io_pool.submit(reader, path)
+        self._thread = QThread(self)
+        self._worker = ConvertWorker(self, path, output, ext, read_future)
+        self._worker.moveToThread(self._thread)
+        self._thread.started.connect(self._worker.run)
+        self._worker.finished.connect(self.on_convert_finished)
+        self._worker.error.connect(self.on_convert_error)
+        self._worker.finished.connect(self._thread.quit)
+        self._worker.error.connect(self._thread.quit)
+        self._thread.finished.connect(self._worker.deleteLater)
+        self._thread.finished.connect(self._thread.deleteLater)
+        self._thread.start()
+
+    def batch_convert(self, paths):
+        # 批量模式：每个文件交给一个工作进程转换，文件间互不相关，
+        # 多进程绕开GIL后可随核数近线性加速
+        paths = [p for p in paths if p.lower().endswith(_PDF_OFD)]
+        if not paths:
             QMessageBox.warning(self, "不支持", "仅支持 .pdf 或 .ofd 文件！")
-            self.statusbar.showMessage("仅支持 .pdf 或 .ofd 文件！")
-            msg = "仅支持 .pdf 或 .ofd 文件！"
             return
+        self.convertButton.setEnabled(False)
+        self.statusbar.showMessage(f"批量转换 {len(paths)} 个文件...")
+        self._batch_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        self._batch_futures = [
+            self._batch_pool.submit(_convert_one, p) for p in paths
+        ]
+        # 主线程用定时器轮询进度，避免从工作进程回调Qt对象
+        self._batch_timer = QTimer(self)
+        self._batch_timer.setInterval(200)
+        self._batch_timer.timeout.connect(self._poll_batch)
+        self._batch_timer.start()
+
+    @pyqtSlot()
+    def _poll_batch(self):
+        done = sum(1 for f in self._batch_futures if f.done())
+        total = len(self._batch_futures)
+        self.statusbar.showMessage(f"批量转换进度 {done}/{total}")
+        if done < total:
+            return
+        self._batch_timer.stop()
+        self._batch_pool.shutdown(wait=False)
+        ok = sum(
+            1 for f in self._batch_futures if not f.exception() and f.result()
+        )
+        self.convertButton.setEnabled(True)
+        msg = f"批量转换完成：成功 {ok} 个，失败/跳过 {total - ok} 个"
+        self.statusbar.showMessage(msg)
+        QMessageBox.information(self, "完成", msg)
+
+    @pyqtSlot(str)
+    def on_convert_finished(self, output):
+        self.convertButton.setEnabled(True)
+        self.statusbar.showMessage(f"{output} 转换完成!")
+        QMessageBox.information(self, "成功!", f"{output} 转换完成！")
 
-        QMessageBox.information(self, "成功!", msg)
+    @pyqtSlot(str)
+    def on_convert_error(self, msg):
+        self.convertButton.setEnabled(True)
+        self.statusbar.showMessage(msg)
+        QMessageBox.critical(self, "错误", msg)
 
 
 if __name__ == "__main__":
+    # 日志收敛到WARNING并走后台队列写出，转换热路径不再被
+    # easyofd内部大量INFO/DEBUG日志的格式化和stderr刷新拖慢
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING", enqueue=True)
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()